@@ -1,23 +1,53 @@
+import functools
 import itertools
-import json
+import math
 import os
 import random
-import uuid
+from pathlib import Path
 
+import orjson
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
 
 from notesapi.v1.models import Note
 
+# Default number of rows per INSERT statement. Kept well below the usual
+# `max_allowed_packet` for the generated notes; override with the
+# BULK_CREATE_BATCH_SIZE environment variable.
+DEFAULT_BATCH_SIZE = int(os.environ.get('BULK_CREATE_BATCH_SIZE', 500))
 
-def extract_comma_separated_list(option, value, parser):
+# Number of words in a note text/tags list, with their cumulative weights.
+TEXT_LEN_POP, TEXT_LEN_CUM = (10, 25, 100), (5, 8, 10)
+TAG_LEN_POP, TAG_LEN_CUM = (1, 2, 5, 10, 15), (40, 70, 85, 95, 100)
+
+# Indexed note columns that can be left unindexed while seeding, see `--drop_indexes`.
+INDEXED_FIELDS = ('user_id', 'course_id')
+
+# Every seeded note gets the same (arbitrary) ranges.
+RANGES_DEFAULT_JSON = orjson.dumps(
+    [{"start": "/div[1]/p[1]", "end": "/div[1]/p[1]", "startOffset": 0, "endOffset": 6}]
+).decode()
+
+
+@functools.cache
+def _load_notes_text():
+    """
+    Return the words that random notes are made of, read once per process.
+    """
+    return tuple((Path(__file__).with_name('data') / 'basic_words.txt').read_text().split())
+
+
+def extract_comma_separated_list(value):
     """Parse an option string as a comma separated list"""
-    setattr(parser.values, option.dest, [course_id.strip() for course_id in value.split(',')])
+    return [course_id.strip() for course_id in value.split(',')]
 
 
 class Command(BaseCommand):
     args = '<total_notes>'
 
     def add_arguments(self, parser):
+        parser.add_argument('args', metavar='total_notes', nargs='*')
+
         parser.add_argument(
             '--per_user',
             action='store',
@@ -28,9 +58,8 @@ class Command(BaseCommand):
 
         parser.add_argument(
             '--course_ids',
-            action='callback',
-            callback=extract_comma_separated_list,
-            type=str,
+            action='store',
+            type=extract_comma_separated_list,
             default=['edX/DemoX/Demo_Course'],
             help='comma-separated list of course_ids for which notes should be randomly attributed'
         )
@@ -39,9 +68,16 @@ class Command(BaseCommand):
             '--batch_size',
             action='store',
             type=int,
-            default=1000,
+            default=DEFAULT_BATCH_SIZE,
             help='number of notes that should be bulk inserted at a time - useful for getting around the maximum SQL '
-                 'query size'
+                 f'query size (default {DEFAULT_BATCH_SIZE})'
+        )
+
+        parser.add_argument(
+            '--drop_indexes',
+            action='store_true',
+            help='drop the user_id and course_id indexes while inserting and rebuild them afterwards - much faster '
+                 'for large numbers of notes, but queries on notes are slow until the indexes are back'
         )
 
     help = 'Add N random notes to the database'
@@ -55,10 +91,58 @@ class Command(BaseCommand):
         course_ids = options['course_ids']
         batch_size = options['batch_size']
 
-        # In production, there is a max SQL query size.  Batch the bulk inserts
-        # such that we don't exceed this limit.
-        for notes_chunk in grouper_it(note_iter(total_notes, notes_per_user, course_ids), batch_size):
-            Note.objects.bulk_create(notes_chunk)
+        dropped_indexes = drop_field_indexes() if options['drop_indexes'] else []
+        try:
+            # In production, there is a max SQL query size.  Batch the bulk inserts
+            # such that we don't exceed this limit, and commit them all at once
+            # rather than once per batch.
+            with transaction.atomic(using='default'):
+                for notes_chunk in grouper_it(note_iter(total_notes, notes_per_user, course_ids), batch_size):
+                    Note.objects.bulk_create(notes_chunk, batch_size=batch_size)
+        finally:
+            if dropped_indexes:
+                with connection.schema_editor() as schema_editor:
+                    for index in dropped_indexes:
+                        schema_editor.add_index(Note, index)
+
+
+def drop_field_indexes():
+    """
+    Drop the single-column indexes on the `INDEXED_FIELDS` of notes.
+
+    Updating these indexes for every inserted row dominates the cost of large bulk
+    inserts; building them once afterwards is much cheaper. Only the plain index Django
+    creates for `db_index` is dropped: introspection does not report everything an index
+    was created with (e.g. the `varchar_pattern_ops` of PostgreSQL's `_like` indexes), so
+    any other index is left alone rather than recreated differently.
+
+    Returns:
+        list: the dropped `models.Index`, to be added back once notes are inserted.
+    """
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, Note._meta.db_table)
+    indexes = []
+    with connection.schema_editor() as schema_editor:
+        for field_name in INDEXED_FIELDS:
+            column = Note._meta.get_field(field_name).column
+            # pylint: disable=protected-access
+            name = schema_editor._create_index_name(Note._meta.db_table, [column])
+            if name in constraints and is_plain_index(constraints[name], column):
+                indexes.append(models.Index(fields=[field_name], name=name))
+        for index in indexes:
+            schema_editor.remove_index(Note, index)
+    return indexes
+
+
+def is_plain_index(constraint, column):
+    """
+    Return whether an introspected table constraint is a plain ascending b-tree index on `column`.
+    """
+    if not constraint['index'] or constraint['unique'] or constraint['primary_key']:
+        return False
+    if constraint['columns'] != [column] or constraint.get('type') != models.Index.suffix:
+        return False
+    return constraint.get('orders', ['ASC']) == ['ASC'] and not constraint.get('options')
 
 
 def note_iter(total_notes, notes_per_user, course_ids):
@@ -74,44 +158,59 @@ def note_iter(total_notes, notes_per_user, course_ids):
     Returns:
         generator: An iterable of note models.
     """
-    DATA_DIRECTORY = os.path.join(os.path.dirname(__file__), "data/")
-    with open(os.path.join(DATA_DIRECTORY, 'basic_words.txt')) as f:
-        notes_text = [word for line in f for word in line.split()]
+    notes_text = _load_notes_text()
 
-    def weighted_get_words(weighted_num_words):
+    def get_words(word_count):
         """
-        Return random words of of a length of weighted probability.
-        `weighted_num_words` should look like [(word_count, weight), (word_count, weight) ...]
+        Return `word_count` random words. Words may repeat, which is fine for seed data.
         """
-        return random.sample(
-            notes_text,
-            random.choice([word_count for word_count, weight in weighted_num_words for i in range(weight)])
-        )
+        return random.choices(notes_text, k=word_count)
 
-    def get_new_user_id():
-        return uuid.uuid4().hex
+    # Draw the per-user and per-course columns up front instead of one
+    # value at a time inside the loop.
+    user_ids = list(random_hex_ids(math.ceil(total_notes / notes_per_user)))
+    note_course_ids = random.choices(course_ids, k=total_notes)
+    text_lengths = random.choices(TEXT_LEN_POP, cum_weights=TEXT_LEN_CUM, k=total_notes)
+    tag_lengths = random.choices(TAG_LEN_POP, cum_weights=TAG_LEN_CUM, k=total_notes)
 
-    user_id = get_new_user_id()
-
-    for note_count in range(total_notes):
-        if note_count % notes_per_user == 0:
-            user_id = get_new_user_id()
+    columns = zip(note_course_ids, random_hex_ids(total_notes), text_lengths, tag_lengths)
+    for note_count, (course_id, usage_id, text_length, tag_length) in enumerate(columns):
         # Notice that quote and ranges are arbitrary
         yield Note(
-            user_id=user_id,
-            course_id=random.choice(course_ids),
-            usage_id=uuid.uuid4().hex,
+            user_id=user_ids[note_count // notes_per_user],
+            course_id=course_id,
+            usage_id=usage_id,
             quote='foo bar baz',
-            text=' '.join(weighted_get_words([(10, 5), (25, 3), (100, 2)])),
-            ranges=json.dumps([{"start": "/div[1]/p[1]", "end": "/div[1]/p[1]", "startOffset": 0, "endOffset": 6}]),
-            tags=json.dumps(weighted_get_words([(1, 40), (2, 30), (5, 15), (10, 10), (15, 5)]))
+            text=' '.join(get_words(text_length)),
+            ranges=RANGES_DEFAULT_JSON,
+            tags=orjson.dumps(get_words(tag_length)).decode()
         )
 
 
+def random_hex_ids(count, block_size=4096):
+    """
+    Yield `count` random 32-character hex ids.
+
+    They look like `uuid.uuid4().hex` values, without the version bits, which is
+    enough for seed data. Random bytes are read `block_size` ids at a time instead
+    of with one `os.urandom` call per id.
+    """
+    while count > 0:
+        block_count = min(count, block_size)
+        hex_block = os.urandom(16 * block_count).hex()
+        for start in range(0, 32 * block_count, 32):
+            yield hex_block[start:start + 32]
+        count -= block_count
+
+
 def grouper_it(iterable, batch_size):
     """
     Return an iterator of iterators.  Each child iterator yields the
     next `batch_size`-many elements from `iterable`.
+
+    The child iterators are lazy: `bulk_create` turns its argument into a
+    list, so each batch is materialized exactly once, and handing it the
+    whole `note_iter` instead would build every note in memory up front.
     """
     while True:
         chunk_it = itertools.islice(iterable, batch_size)
@@ -0,0 +1,42 @@
+""" Add trigram indexes backing the text search fallback on PostgreSQL """
+
+from django.db import migrations
+
+TRIGRAM_INDEXES = (
+    ('v1_note_text_trgm', 'text'),
+    ('v1_note_tags_trgm', 'tags'),
+)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """
+    Index UPPER(text) and UPPER(tags) with gin_trgm_ops, the expression Django emits for `__icontains`.
+
+    Other backends have no equivalent for substring matching and are left untouched.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON v1_note USING gin (UPPER({column}) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _column in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+    """ Add trigram indexes backing the text search fallback on PostgreSQL """
+
+    dependencies = [
+        ('v1', '0003_auto_20200703_1515'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
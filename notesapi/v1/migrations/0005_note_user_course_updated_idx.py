@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-15 04:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('v1', '0004_note_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['user_id', 'course_id', '-updated'], name='note_user_course_updated_idx'),
+        ),
+    ]
@@ -1,5 +1,4 @@
-import json
-
+import orjson
 from django.core.exceptions import ValidationError
 from django.db import models
 
@@ -22,6 +21,12 @@ class Note(models.Model):
     updated = models.DateTimeField(auto_now=True)
     tags = models.TextField(help_text="JSON, list of comma-separated tags", default="[]")
 
+    class Meta:
+        indexes = [
+            # Serves the per-user, per-course listing, its newest-first ordering and the notes limit count.
+            models.Index(fields=['user_id', 'course_id', '-updated'], name='note_user_course_updated_idx'),
+        ]
+
     @classmethod
     def create(cls, note_dict):
         """
@@ -38,8 +43,12 @@ class Note(models.Model):
         if len(ranges) < 1:
             raise ValidationError('Note must contain at least one range.')
 
-        note_dict['ranges'] = json.dumps(ranges)
+        try:
+            note_dict['ranges'] = orjson.dumps(ranges).decode()
+            note_dict['tags'] = orjson.dumps(note_dict.get('tags', [])).decode()
+        except orjson.JSONEncodeError as error:
+            # e.g. integers beyond 64 bits, which orjson does not encode.
+            raise ValidationError(f'Note ranges and tags must be encodable as JSON: {error}') from error
         note_dict['user_id'] = note_dict.pop('user', None)
-        note_dict['tags'] = json.dumps(note_dict.get('tags', []), ensure_ascii=False)
 
         return cls(**note_dict)
@@ -1,12 +1,22 @@
+import hashlib
 import logging
+import threading
+import time
 
 import jwt
+from cachetools import TTLCache
 from django.conf import settings
 from rest_framework.permissions import BasePermission
 from rest_framework_jwt.settings import api_settings
 
 logger = logging.getLogger(__name__)
 
+# Claims of recently decoded tokens. Keys are digests, so raw tokens are not kept in memory.
+_decoded_tokens = TTLCache(maxsize=4096, ttl=60)
+_decoded_tokens_lock = threading.Lock()
+
+METHODS_WITH_BODY = ('POST', 'PUT', 'PATCH', 'DELETE')
+
 
 class TokenWrongIssuer(Exception):
     pass
@@ -38,33 +48,8 @@ class HasAccessToken(BasePermission):
             logger.debug("No token found in headers")
             return False
         try:
-            # TODO: Determine how and if we could remove `jwt.decode` from being called directly from this
-            #   service. Instead, use `jwt_decode_handler` or other library code that is used in other services.
-            #   It would be useful to simplify authentication within the platform, especially during upgrades of
-            #   authentication related dependencies.
-            data = jwt.decode(
-                token,
-                settings.CLIENT_SECRET,
-                algorithms=[api_settings.JWT_ALGORITHM],
-                audience=settings.CLIENT_ID
-            )
-            auth_user = data['sub']
-            user_found = False
-            for request_field in ('GET', 'POST', 'data'):
-                if 'user' in getattr(request, request_field):
-                    req_user = getattr(request, request_field)['user']
-                    if req_user == auth_user:
-                        user_found = True
-                        # but we do not break or return here,
-                        # because `user` may be present in more than one field (GET, POST)
-                        # and we must make sure that all of them are correct
-                    else:
-                        logger.debug("Token user %s did not match %s user %s", auth_user, request_field, req_user)
-                        return False
-            if user_found:
-                return True
-            else:
-                logger.info("No user was present to compare in GET, POST or DATA")
+            data = decode_token(token)
+            return self._is_request_user_matched(request, data['sub'])
         except jwt.ExpiredSignatureError:
             logger.debug("Token was expired: %s", token)
         except jwt.DecodeError:
@@ -72,3 +57,62 @@ class HasAccessToken(BasePermission):
         except jwt.InvalidAudienceError:
             logger.debug("Token has wrong issuer %s", token)
         return False
+
+    @staticmethod
+    def _is_request_user_matched(request, auth_user):
+        """
+        Check that the `user` sent with the request is present and matches the token user.
+
+        The body is only looked at for methods that carry one: accessing `request.POST`
+        or `request.data` makes DRF parse it.
+        """
+        sources = [('GET', request.GET)]
+        if request.method in METHODS_WITH_BODY:
+            sources += [('POST', request.POST), ('data', request.data)]
+
+        user_found = False
+        for request_field, params in sources:
+            if 'user' not in params:
+                continue
+            req_user = params['user']
+            if req_user != auth_user:
+                logger.debug("Token user %s did not match %s user %s", auth_user, request_field, req_user)
+                return False
+            # but we do not break or return here,
+            # because `user` may be present in more than one field (GET, POST)
+            # and we must make sure that all of them are correct
+            user_found = True
+        if not user_found:
+            logger.info("No user was present to compare in GET, POST or DATA")
+        return user_found
+
+
+def decode_token(token):
+    """
+    Verify and decode `token`, reusing the claims of tokens decoded within the last minute.
+
+    Only valid tokens are cached, and their expiration is checked again on every cache hit.
+    """
+    key = hashlib.blake2b(
+        "\0".join((token, settings.CLIENT_SECRET, settings.CLIENT_ID)).encode(), digest_size=16
+    ).digest()
+    with _decoded_tokens_lock:
+        data = _decoded_tokens.get(key)
+
+    if data is None:
+        # TODO: Determine how and if we could remove `jwt.decode` from being called directly from this
+        #   service. Instead, use `jwt_decode_handler` or other library code that is used in other services.
+        #   It would be useful to simplify authentication within the platform, especially during upgrades of
+        #   authentication related dependencies.
+        data = jwt.decode(
+            token,
+            settings.CLIENT_SECRET,
+            algorithms=[api_settings.JWT_ALGORITHM],
+            audience=settings.CLIENT_ID
+        )
+        with _decoded_tokens_lock:
+            _decoded_tokens[key] = data
+    elif "exp" in data and data["exp"] <= time.time():
+        raise jwt.ExpiredSignatureError("Signature has expired")
+
+    return data
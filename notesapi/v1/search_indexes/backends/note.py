@@ -1,9 +1,14 @@
-from itertools import chain
+from functools import reduce
+from operator import or_
 
+from django_elasticsearch_dsl_drf.constants import LOOKUP_FILTER_TERM, LOOKUP_QUERY_IN
 from django_elasticsearch_dsl_drf.filter_backends import (
     CompoundSearchFilterBackend as CompoundSearchFilterBackendOrigin,
     FilteringFilterBackend as FilteringFilterBackendOrigin,
 )
+from django_elasticsearch_dsl_drf.filter_backends.search.query_backends import MatchQueryBackend
+from elasticsearch_dsl.query import Q
+
 from notesapi.v1.utils import Request
 
 __all__ = ('CompoundSearchFilterBackend', 'FilteringFilterBackend')
@@ -13,8 +18,15 @@ __all__ = ('CompoundSearchFilterBackend', 'FilteringFilterBackend')
 class CompoundSearchFilterBackend(CompoundSearchFilterBackendOrigin):
     """
     Extends compound search backend.
+
+    Notes have no nested fields, so only the match query backend is used: all the
+    search terms end up in a single `bool` query built in one pass over the params.
     """
 
+    query_backends = [
+        MatchQueryBackend,
+    ]
+
     search_fields = (
         'text',
         'tags',
@@ -29,13 +41,12 @@ class CompoundSearchFilterBackend(CompoundSearchFilterBackendOrigin):
         :return: List of search query params.
         :rtype: list
         """
-        query_params = request.query_params.copy()
-        return list(
-            chain.from_iterable(
-                query_params.getlist(search_param, [])
-                for search_param in self.search_fields
-            )
-        )
+        query_params = request.query_params
+        return [
+            value
+            for search_param in self.search_fields
+            for value in query_params.getlist(search_param)
+        ]
 
 
 class FilteringFilterBackend(FilteringFilterBackendOrigin):
@@ -55,3 +66,31 @@ class FilteringFilterBackend(FilteringFilterBackendOrigin):
         simulated_request = Request(view.query_params)
 
         return super().get_filter_query_params(simulated_request, view)
+
+    def filter_queryset(self, request, queryset, view):
+        """
+        Filter the queryset.
+
+        The parent class clones the search once per filter. The notes search only
+        uses the default (`terms`), `term` and `in` lookups, so these are collected and
+        applied to the search at once; any other lookup falls back to the parent.
+        """
+        filters = []
+        queries = []
+        for options in self.get_filter_query_params(request, view).values():
+            field, values, lookup = options['field'], options['values'], options['lookup']
+            if lookup is None:
+                filters.append(Q('terms', **{field: values}))
+            elif lookup == LOOKUP_FILTER_TERM:
+                filters.extend(Q('term', **{field: value}) for value in values)
+            elif lookup == LOOKUP_QUERY_IN:
+                queries.extend(
+                    reduce(or_, (Q('term', **{field: term}) for term in self.split_lookup_complex_value(value)))
+                    for value in values
+                )
+            else:
+                return super().filter_queryset(request, queryset, view)
+
+        if filters or queries:
+            queryset = queryset.query('bool', filter=filters, must=queries)
+        return queryset
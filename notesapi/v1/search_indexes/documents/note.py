@@ -1,6 +1,6 @@
-import json
 import logging
 
+import orjson
 from django.conf import settings
 from django_elasticsearch_dsl import Document, fields, Index
 
@@ -39,15 +39,13 @@ class NoteDocument(Document):
 
     def prepare_tags(self, instance):
         try:
-            tags = json.loads(instance.tags)
-        except ValueError as exc:
+            tags = orjson.loads(instance.tags)
+        except orjson.JSONDecodeError as exc:
             log.warning("Field `tags` contains corrupted data. Data: %r. Exception: %r", instance.tags, exc)
             tags = []
         return tags
 
     class Django:
         model = Note
-
-    class Meta:
-        parallel_indexing = True
-        queryset_pagination = 50
+        # Rows fetched per database round-trip, and documents per bulk request, when indexing.
+        queryset_pagination = 500
@@ -2,14 +2,121 @@
 Paginator for Document Notes where storage is elasticsearch database.
 """
 
-from django_elasticsearch_dsl_drf.pagination import PageNumberPagination
+import binascii
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+import orjson
+from django.utils.translation import gettext_lazy as _
+from django_elasticsearch_dsl_drf.pagination import Page, QueryFriendlyPageNumberPagination
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 from ..utils import NotesPaginatorMixin
 
 __all__ = ('NotesPagination',)
 
 
-class NotesPagination(NotesPaginatorMixin, PageNumberPagination):
+class NotesPagination(NotesPaginatorMixin, QueryFriendlyPageNumberPagination):
     """
     Student Document Notes Paginator.
+
+    The total number of notes is read from the search response itself, rather than
+    from a separate `_count` request to Elasticsearch.
+
+    Passing `search_after` (empty for the first page) switches to cursor paging: each
+    page resumes from the sort values of the previous page's last hit instead of an
+    offset, so Elasticsearch does not collect and discard `from` hits per shard and
+    paging is not capped by `index.max_result_window`. The `next` link carries the
+    cursor; the response otherwise keeps the page number format.
     """
+
+    # Orphans are not supported, as with the counting paginator this one replaced.
+    orphans_query_param = None
+    # Elasticsearch's default `index.max_result_window`: it rejects searches whose `from` + `size` exceed it.
+    max_result_window = 10000
+    max_page_size = max_result_window
+    search_after_query_param = 'search_after'
+    invalid_cursor_message = _('Invalid cursor')
+    cursor = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.search_after_query_param in request.query_params:
+            return self.paginate_search_after(queryset, request)
+
+        page_number = request.query_params.get(self.page_query_param) or 1
+        if page_number in self.last_page_strings:
+            # Only the counting paginator knows the number of the last page before fetching it.
+            return super(QueryFriendlyPageNumberPagination, self).paginate_queryset(queryset, request, view=view)
+        # The query friendly paginator slices the search before validating the number, so
+        # reject anything that is not a page number up front, as `PageNumberPagination` does.
+        # Pages past the result window are rejected here too, rather than by Elasticsearch.
+        try:
+            valid = 1 <= int(page_number) <= self.max_result_window // self.get_page_size(request)
+        except ValueError:
+            valid = False
+        if not valid:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=''))
+        return super().paginate_queryset(queryset, request, view=view)
+
+    def paginate_search_after(self, queryset, request):
+        """
+        Return the page following the cursor in the `search_after` query parameter.
+        """
+        page_size = self.get_page_size(request)
+        start, search_after = self.decode_cursor(
+            request.query_params[self.search_after_query_param], len(queryset.to_dict().get('sort', ()))
+        )
+        if search_after:
+            queryset = queryset.extra(search_after=search_after)
+        response = queryset[:page_size].execute()
+
+        # pylint: disable=attribute-defined-outside-init
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = int(self.get_es_count(response))
+        self.page = Page(response, start // page_size + 1, paginator, facets=None)
+        self.cursor = (start + len(response), list(response.hits[-1].meta.sort) if response.hits else search_after)
+        self.request = request
+        return list(self.page)
+
+    def get_next_link(self):
+        if self.cursor is None:
+            return super().get_next_link()
+        if not self.page.has_next():
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.search_after_query_param, self.encode_cursor(*self.cursor))
+
+    def get_previous_link(self):
+        url = super().get_previous_link()
+        if url is None or self.cursor is None:
+            return url
+        # Cursors only run forward; earlier pages are addressed by number.
+        return remove_query_param(url, self.search_after_query_param)
+
+    @staticmethod
+    def encode_cursor(start, search_after):
+        """
+        Pack the offset of the next page and the sort values it resumes after.
+        """
+        return urlsafe_b64encode(orjson.dumps([start, search_after])).decode()
+
+    def decode_cursor(self, encoded, sort_length):
+        """
+        Return the `(start, search_after)` pair of a cursor; an empty cursor is the first page.
+
+        The sort values must be scalars, one per key of the search sort, or Elasticsearch
+        rejects the search.
+        """
+        if not encoded:
+            return 0, None
+        try:
+            start, search_after = orjson.loads(urlsafe_b64decode(encoded.encode()))
+        except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+        if (
+            not isinstance(start, int) or start < 0
+            or not isinstance(search_after, list) or len(search_after) != sort_length
+            or not all(isinstance(value, (int, float, str)) for value in search_after)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return start, search_after
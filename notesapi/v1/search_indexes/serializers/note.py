@@ -1,5 +1,4 @@
-import json
-
+import orjson
 from django_elasticsearch_dsl_drf.serializers import DocumentSerializer
 from rest_framework import serializers
 
@@ -35,25 +34,38 @@ class NoteDocumentSerializer(DocumentSerializer):
             'updated',
         )
 
+    def to_representation(self, instance):
+        """
+        Look up the highlights of the hit once for all the fields that use them.
+        """
+        highlight = getattr(instance.meta, 'highlight', None)
+        # pylint: disable=attribute-defined-outside-init
+        self._highlight = highlight.to_dict() if highlight else {}
+        return super().to_representation(instance)
+
     def get_text(self, note):
         """
         Return note text.
         """
-        if hasattr(note.meta, 'highlight') and hasattr(note.meta.highlight, 'text'):
-            return note.meta.highlight.text[0]
+        highlighted_text = self._highlight.get('text')
+        if highlighted_text:
+            return highlighted_text[0]
         return note.text
 
     def get_ranges(self, note):
         """
         Return note ranges.
         """
-        return json.loads(note.ranges)
+        try:
+            return orjson.loads(note.ranges)
+        except orjson.JSONDecodeError:
+            return []
 
     def get_tags(self, note):
         """
         Return note tags.
         """
-        if hasattr(note.meta, 'highlight') and hasattr(note.meta.highlight, 'tags'):
-            return list(note.meta.highlight.tags)
+        if 'tags' in self._highlight:
+            return list(self._highlight['tags'])
 
         return list(note.tags) if note.tags else []
@@ -2,8 +2,7 @@
 Serializers for Notes API.
 """
 
-import json
-
+import orjson
 from rest_framework import serializers
 
 from notesapi.v1.models import Note
@@ -29,10 +28,10 @@ class NoteSerializer(serializers.ModelSerializer):
         """
         Return note ranges.
         """
-        return json.loads(note.ranges)
+        return orjson.loads(note.ranges)
 
     def get_tags(self, note):
         """
         Return note tags.
         """
-        return json.loads(note.tags)
+        return orjson.loads(note.tags)
@@ -0,0 +1,82 @@
+import json
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from notesapi.v1.models import Note
+
+
+class BulkCreateNotesTest(TestCase):
+    """
+    Tests for the bulk_create_notes command.
+    """
+
+    def test_create(self):
+        """
+        Ensure random notes are attributed to the requested users and courses.
+        """
+        call_command('bulk_create_notes', '25', '--per_user', '10', '--course_ids', 'course-a, course-b',
+                     '--batch_size', '7')
+
+        self.assertEqual(Note.objects.count(), 25)
+        self.assertEqual(Note.objects.values('user_id').distinct().count(), 3)
+        self.assertTrue(set(Note.objects.values_list('course_id', flat=True)) <= {'course-a', 'course-b'})
+        for note in Note.objects.all():
+            self.assertEqual(len(note.usage_id), 32)
+            self.assertTrue(note.text)
+            self.assertEqual(len(json.loads(note.ranges)), 1)
+            self.assertTrue(json.loads(note.tags))
+
+
+class BulkCreateNotesDropIndexesTest(TransactionTestCase):
+    """
+    Tests for the --drop_indexes option of the bulk_create_notes command.
+
+    Schema changes cannot run inside the transaction wrapping each `TestCase` test.
+    """
+
+    def get_indexes(self):
+        """
+        Return the introspected indexes of the notes table.
+        """
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Note._meta.db_table)
+        return {name: constraint for name, constraint in constraints.items() if constraint['index']}
+
+    def test_drop_indexes(self):
+        """
+        Ensure the indexes are dropped during the insert and are all back afterwards.
+        """
+        indexes = self.get_indexes()
+        indexes_during_insert = []
+
+        def bulk_create(objs, **kwargs):
+            indexes_during_insert.append(self.get_indexes())
+            return original_bulk_create(objs, **kwargs)
+
+        original_bulk_create = Note.objects.bulk_create
+        with patch.object(Note.objects, 'bulk_create', side_effect=bulk_create):
+            call_command('bulk_create_notes', '10', '--per_user', '5', '--drop_indexes')
+
+        self.assertEqual(Note.objects.count(), 10)
+        self.assertEqual(self.get_indexes(), indexes)
+        self.assertTrue(indexes_during_insert)
+        for name, constraint in indexes_during_insert[0].items():
+            self.assertNotEqual(constraint['columns'], ['user_id'], name)
+            self.assertNotEqual(constraint['columns'], ['course_id'], name)
+        self.assertIn('note_user_course_updated_idx', indexes_during_insert[0])
+
+    def test_drop_indexes_failed_insert(self):
+        """
+        Ensure the indexes are back, and nothing is inserted, when inserting fails.
+        """
+        indexes = self.get_indexes()
+
+        with patch.object(Note.objects, 'bulk_create', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                call_command('bulk_create_notes', '10', '--per_user', '5', '--drop_indexes')
+
+        self.assertEqual(Note.objects.count(), 0)
+        self.assertEqual(self.get_indexes(), indexes)
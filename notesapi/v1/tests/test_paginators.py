@@ -0,0 +1,114 @@
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import ddt
+from elasticsearch.exceptions import RequestError
+from elasticsearch_dsl import Search
+from elasticsearch_dsl.response import Response
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from notesapi.v1.search_indexes.paginators import NotesPagination
+
+
+@ddt.ddt
+class NotesPaginationTest(TestCase):
+    """
+    Tests for the Elasticsearch notes paginator, against a fake search of 12 hits.
+    """
+
+    total = 12
+
+    def setUp(self):
+        self.executed = []
+        self.enterContext(patch.object(Search, "execute", autospec=True, side_effect=self._execute))
+        self.enterContext(patch.object(Search, "count", autospec=True, return_value=self.total))
+
+    def _execute(self, search, ignore_cache=False):  # pylint: disable=unused-argument
+        body = search.to_dict()
+        self.executed.append(body)
+        start = body.get("from", 0)
+        if start + body.get("size", 10) > NotesPagination.max_result_window:
+            raise RequestError(400, "search_phase_execution_exception", "Result window is too large")
+        hits = [
+            {"_id": str(i), "_source": {"id": i}, "sort": [1000 - i, i]}
+            for i in range(start, min(start + body.get("size", 10), self.total))
+        ]
+        return Response(search, {"hits": {"total": {"value": self.total}, "hits": hits}})
+
+    def paginate(self, query_string, page_size=5):
+        """
+        Paginate the fake search for a request with the given query string.
+        """
+        paginator = NotesPagination()
+        request = Request(APIRequestFactory().get(f"/api/v1/search/?page_size={page_size}&{query_string}"))
+        rows = paginator.paginate_queryset(Search().sort("-updated", "-id"), request, view=Mock(action=""))
+        return paginator.get_paginated_response(rows).data
+
+    def test_page(self):
+        response = self.paginate("page=2")
+        self.assertEqual(response["current_page"], 2)
+        self.assertEqual(response["start"], 5)
+        self.assertEqual(response["total"], self.total)
+        self.assertEqual(response["num_pages"], 3)
+        self.assertEqual([row.id for row in response["rows"]], [5, 6, 7, 8, 9])
+        self.assertEqual(len(self.executed), 1)
+
+    def test_last_page(self):
+        response = self.paginate("page=last")
+        self.assertEqual(response["current_page"], 3)
+        self.assertEqual([row.id for row in response["rows"]], [10, 11])
+        self.assertIsNone(response["next"])
+
+    @ddt.data("abc", "0", "-1", "1.5")
+    def test_invalid_page(self, page):
+        with self.assertRaises(NotFound):
+            self.paginate(f"page={page}")
+        self.assertEqual(self.executed, [])
+
+    def test_page_out_of_range(self):
+        with self.assertRaises(NotFound):
+            self.paginate("page=4")
+
+    def test_page_size_capped(self):
+        response = self.paginate("page=1", page_size=20000)
+        self.assertEqual(len(response["rows"]), self.total)
+        self.assertEqual(self.executed[-1]["from"], 0)
+        self.assertEqual(self.executed[-1]["size"], NotesPagination.max_result_window)
+
+    def test_last_page_in_result_window(self):
+        with self.assertRaises(NotFound):
+            self.paginate("page=2000")
+        self.assertEqual(self.executed[-1]["from"], 9995)
+        self.assertEqual(self.executed[-1]["size"], 5)
+
+    def test_page_past_result_window(self):
+        with self.assertRaises(NotFound):
+            self.paginate("page=2001")
+        self.assertEqual(self.executed, [])
+
+    def test_orphans_ignored(self):
+        response = self.paginate("page=3&orphans=abc")
+        self.assertEqual([row.id for row in response["rows"]], [10, 11])
+
+    def test_search_after(self):
+        response = self.paginate("search_after=")
+        self.assertEqual([row.id for row in response["rows"]], [0, 1, 2, 3, 4])
+        self.assertIn("search_after=", response["next"])
+
+        paginator = NotesPagination()
+        request = Request(APIRequestFactory().get(response["next"]))
+        paginator.paginate_queryset(Search().sort("-updated", "-id"), request, view=Mock(action=""))
+        self.assertEqual(self.executed[-1]["search_after"], [996, 4])
+        self.assertEqual(paginator.page.number, 2)
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(NotFound):
+            self.paginate("search_after=zz!")
+
+    @ddt.data([0, ["x"]], [0, [1, 2, 3]], [0, [{"a": 1}, 2]], [0, [None, 2]])
+    def test_invalid_cursor_sort_values(self, cursor):
+        with self.assertRaises(NotFound):
+            self.paginate(f"search_after={NotesPagination.encode_cursor(*cursor)}")
+        self.assertEqual(self.executed, [])
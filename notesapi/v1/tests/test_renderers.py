@@ -0,0 +1,37 @@
+import datetime
+from unittest import TestCase
+
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from notesapi.v1.renderers import OrjsonRenderer
+
+
+class OrjsonRendererTest(TestCase):
+    def setUp(self):
+        self.data = {
+            "id": 1,
+            "text": "Ammar محمد عمار Muhammad",
+            "tags": ["pink", "lady"],
+            "ranges": [{"startOffset": 0, "endOffset": 10.5}],
+            "updated": datetime.datetime(2014, 12, 11, 10, 9, 8, 765432, tzinfo=datetime.timezone.utc),
+            "error_msg": gettext_lazy("Invalid cursor"),
+            2: None,
+        }
+
+    def test_matches_json_renderer(self):
+        self.assertEqual(OrjsonRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_indent(self):
+        media_type = "application/json; indent=4"
+        self.assertEqual(
+            OrjsonRenderer().render(self.data, media_type),
+            JSONRenderer().render(self.data, media_type),
+        )
+
+    def test_none(self):
+        self.assertEqual(OrjsonRenderer().render(None), b"")
+
+    def test_big_int(self):
+        data = {"tags": [2 ** 70]}
+        self.assertEqual(OrjsonRenderer().render(data), JSONRenderer().render(data))
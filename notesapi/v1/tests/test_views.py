@@ -8,10 +8,14 @@ import ddt
 import jwt
 from django.conf import settings
 from django.core.management import call_command
+from django.db import OperationalError
+from django.test import SimpleTestCase
 from django.test.utils import override_settings
 from django.urls import reverse
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from notesapi.v1.views import AnnotationListView, elasticsearch
 
 from .helpers import get_id_token
 
@@ -273,6 +277,44 @@ class AnnotationListViewTests(BaseAnnotationViewTests):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data['tags'], [])
 
+    def test_create_unencodable_tags(self):
+        """
+        Create a note whose tags hold an integer too large to store as JSON.
+        """
+        payload = self.payload.copy()
+        payload['tags'] = [2 ** 70]
+        response = self.client.post(reverse('api:v1:annotations'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.get_annotations()['total'], 0)
+
+    def test_create_retries_deadlock(self):
+        """
+        Creating a note retries the limit check and insert when the database breaks a deadlock.
+        """
+        insert_within_limit = AnnotationListView.insert_within_limit
+        attempts = []
+
+        def flaky_insert(note):
+            attempts.append(note)
+            if len(attempts) == 1:
+                raise OperationalError(1213, 'Deadlock found when trying to get lock')
+            return insert_within_limit(note)
+
+        with patch.object(AnnotationListView, 'insert_within_limit', side_effect=flaky_insert):
+            data = self._create_annotation()
+        self.assertEqual(len(attempts), 2)
+        self.assertEqual(self._get_annotation(data['id'])['text'], self.payload['text'])
+
+    def test_create_other_operational_error(self):
+        """
+        Database errors other than deadlocks are not retried.
+        """
+        error = OperationalError(2006, 'MySQL server has gone away')
+        with patch.object(AnnotationListView, 'insert_within_limit', side_effect=error) as mock_insert:
+            with self.assertRaises(OperationalError):
+                self._create_annotation()
+        self.assertEqual(mock_insert.call_count, 1)
+
     def test_create_ignore_created(self):
         """
         Test if annotation 'created' field is not used by API.
@@ -598,6 +640,27 @@ class AnnotationDetailViewTests(BaseAnnotationViewTests):
         del annotation['created']
         self.assertEqual(annotation, self.payload)
 
+    def test_read_not_modified(self):
+        """
+        Ensure a client holding the current version of an annotation gets a 304 until it changes.
+        """
+        data = self._create_annotation(text="Foo")
+        url = reverse('api:v1:annotations_detail', kwargs={'annotation_id': data['id']})
+        response = self.client.get(url, self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+
+        response = self.client.get(url, self.headers, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertFalse(response.content)
+
+        self._do_annotation_update(data, {'id': data['id'], 'text': 'Bar'})
+        response = self.client.get(url, self.headers, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['text'], 'Bar')
+
     def test_read_notfound(self):
         """
         Case when no annotation is present with specific id.
@@ -647,6 +710,19 @@ class AnnotationDetailViewTests(BaseAnnotationViewTests):
         response = self.client.put(url, payload, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_update_unencodable_tags(self):
+        """
+        Ensure an update whose tags hold an integer too large to store as JSON is rejected.
+        """
+        data = self._create_annotation(text="Foo")
+
+        payload = self.payload.copy()
+        payload.update({'id': data['id'], 'text': 'Bar', 'tags': [2 ** 70]})
+        url = reverse('api:v1:annotations_detail', kwargs={'annotation_id': data['id']})
+        response = self.client.put(url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self._get_annotation(data['id'])['text'], 'Foo')
+
     def test_update_without_payload_id(self):
         """
         Test if update will be performed when there is no id in payload.
@@ -1149,6 +1225,30 @@ class AnnotationSearchViewTests(BaseAnnotationViewTests):
             start=start
         )
 
+    @unittest.skipIf(settings.ES_DISABLED, "MySQL does not do search_after pagination")
+    def test_pagination_search_after(self):
+        """
+        Verify that following `next` links in cursor mode walks every note exactly once.
+        """
+        for i in range(12):
+            self._create_annotation(text=f'annotation {i}')
+
+        response = self._get_search_results(text='annotation', page_size=5, search_after='')
+        texts = []
+        for current_page, start in ((1, 0), (2, 5), (3, 10)):
+            self.assertEqual(response['total'], 12)
+            self.assertEqual(response['num_pages'], 3)
+            self.assertEqual(response['current_page'], current_page)
+            self.assertEqual(response['start'], start)
+            texts += [row['text'] for row in response['rows']]
+            if response['next'] is None:
+                break
+            self.assertIn('search_after=', response['next'])
+            response = self.client.get(response['next']).data
+
+        self.assertIsNone(response['next'])
+        self.assertEqual(texts, [f'annotation {i}' for i in reversed(range(12))])
+
     @ddt.unpack
     @ddt.data(
         {"text": "Ammar محمد عمار Muhammad", "search": "محمد عمار", "tags": ["عمار", "Muhammad", "محمد"]},
@@ -1236,6 +1336,20 @@ class TokenTests(BaseAnnotationViewTests):
         token = jwt.encode(token, settings.CLIENT_SECRET)
         self._assert_403(token)
 
+    @patch('notesapi.v1.permissions.time')
+    def test_expired_cached_token(self, mocked_time):
+        """
+        403 when a token expires after its claims have been cached
+        """
+        self.headers["course_id"] = "test-course-id"
+        mocked_time.time.return_value = datetime.now(UTC).timestamp()
+        response = self.client.get(self.url, self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        mocked_time.time.return_value += 600
+        response = self.client.get(self.url, self.headers)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
     def test_wrong_issuer(self):
         """
         403 when token's intended audience is wrong
@@ -1268,6 +1382,14 @@ class TokenTests(BaseAnnotationViewTests):
         token = jwt.encode(self.token_data, "some secret")
         self._assert_403(token)
 
+    def test_get_ignores_body(self):
+        """
+        The body of a GET request is not parsed to look for the user
+        """
+        url = self.url + "?" + parse.urlencode({"user": TEST_USER, "course_id": "test-course-id"})
+        response = self.client.generic("GET", url, "{not json", content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
     def test_multifield_user(self):
         """
         403 when user in GET matches token, but in POST does not
@@ -1276,3 +1398,28 @@ class TokenTests(BaseAnnotationViewTests):
         self.payload['user'] = 'other-user'
         response = self.client.post(url + "?user=" + TEST_USER, self.payload, format='json')
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ElasticsearchSearchQueryTests(SimpleTestCase):
+    """
+    Test the query the Elasticsearch search view builds, without an Elasticsearch server.
+    """
+
+    def test_text_search_filters(self):
+        """
+        Filters of a text search are applied on top of the text query.
+        """
+        view = elasticsearch.AnnotationSearchView()
+        view.request = view.initialize_request(
+            APIRequestFactory().get("/api/v1/search/?text=fox&user=u1&course_id=c1")
+        )
+        view.build_query_params_state()
+        query = view.filter_queryset(view.get_queryset()).to_dict()["query"]
+        self.assertEqual(query["bool"]["filter"], [
+            {"terms": {"course_id": ["c1"]}},
+            {"terms": {"user": ["u1"]}},
+        ])
+        self.assertEqual(query["bool"]["should"], [
+            {"match": {"text": {"query": "fox"}}},
+            {"match": {"tags": {"query": "fox"}}},
+        ])
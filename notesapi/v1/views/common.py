@@ -1,10 +1,14 @@
-import json
+import functools
 import logging
 
+import orjson
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.db import OperationalError, transaction
 from django.db.models import Q
-from django.urls import reverse
+from django.urls import get_script_prefix, get_urlconf, reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from django.utils.translation import gettext as _
 from edx_django_utils.monitoring import set_custom_attribute
 from rest_framework import status
@@ -18,6 +22,19 @@ from notesapi.v1.serializers import NoteSerializer
 
 log = logging.getLogger(__name__)
 
+ANNOTATION_ID_PLACEHOLDER = "__annotation_id__"
+
+# MySQL error code of a transaction rolled back to break a deadlock, which is safe to retry.
+ER_LOCK_DEADLOCK = 1213
+
+
+@functools.cache
+def annotation_detail_url_template(script_prefix, urlconf):  # pylint: disable=unused-argument
+    """
+    Reverse the annotation detail URL once per script prefix and urlconf, with a placeholder id.
+    """
+    return reverse("api:v1:annotations_detail", kwargs={"annotation_id": ANNOTATION_ID_PLACEHOLDER})
+
 
 class AnnotationsLimitReachedError(Exception):
     """
@@ -117,17 +134,22 @@ class AnnotationSearchView(ListAPIView):
     search_fields = ("text", "tags")
     ordering = ("-updated",)
 
-    @property
+    @functools.cached_property
     def is_text_search(self):
         """
         We identify text search by the presence of a "text" parameter. Subclasses may
         want to have a different behaviour in such cases.
+
+        Only read once `build_query_params_state` has set `params`; the answer is kept
+        for the rest of the request.
         """
         return "text" in self.params
 
     def get_queryset(self):
         queryset = Note.objects.filter(**self.query_params).order_by("-updated")
         if "text" in self.params:
+            # `__icontains` compiles to UPPER(col) LIKE UPPER(%s); on PostgreSQL the
+            # trigram indexes from migration 0004 serve exactly that expression.
             qs_filter = Q(text__icontains=self.params["text"]) | Q(
                 tags__icontains=self.params["text"]
             )
@@ -142,16 +164,13 @@ class AnnotationSearchView(ListAPIView):
         """
         return NoteSerializer
 
-    @property
+    @functools.cached_property
     def paginator(self):
         """
         The paginator instance associated with the view and used data source, or `None`.
         """
-        if not hasattr(self, "_paginator"):
-            # pylint: disable=attribute-defined-outside-init
-            self._paginator = self.pagination_class() if self.pagination_class else None
-
-        return self._paginator
+        pagination_class = self.pagination_class
+        return pagination_class() if pagination_class else None
 
     def filter_queryset(self, queryset):
         """
@@ -169,7 +188,7 @@ class AnnotationSearchView(ListAPIView):
         """
         List of filter backends, each with a `filter_queryset` method.
         """
-        return []
+        return ()
 
     def list(self, *args, **kwargs):
         """
@@ -189,17 +208,20 @@ class AnnotationSearchView(ListAPIView):
         Use them in order to search annotations in most appropriate storage.
         """
         self.query_params = {}
-        self.params = self.request.query_params.dict()
-        usage_ids = self.request.query_params.getlist("usage_id")
+        # Read-only QueryDict lookups return the last value, as `.dict()` would, without copying.
+        self.params = self.request.query_params
+        usage_ids = self.params.getlist("usage_id")
         if usage_ids:
             self.search_with_usage_id = True
             self.query_params["usage_id__in"] = usage_ids
 
-        if "course_id" in self.params:
-            self.query_params["course_id"] = self.params["course_id"]
+        course_id = self.params.get("course_id")
+        if course_id is not None:
+            self.query_params["course_id"] = course_id
 
-        if "user" in self.params:
-            self.query_params["user_id"] = self.params["user"]
+        user = self.params.get("user")
+        if user is not None:
+            self.query_params["user_id"] = user
 
     def get(self, *args, **kwargs):
         """
@@ -357,6 +379,8 @@ class AnnotationListView(GenericAPIView):
     """
 
     serializer_class = NoteSerializer
+    # Attempts at the locked check and insert of a new note, when the database breaks a deadlock.
+    create_attempts = 3
 
     def get(self, *args, **kwargs):
         """
@@ -388,16 +412,18 @@ class AnnotationListView(GenericAPIView):
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            total_notes = Note.objects.filter(
-                user_id=self.request.data["user"],
-                course_id=self.request.data["course_id"],
-            ).count()
-            if total_notes >= settings.MAX_NOTES_PER_COURSE:
-                raise AnnotationsLimitReachedError
-
             note = Note.create(self.request.data)
             note.full_clean()
 
+            for attempt in range(1, self.create_attempts + 1):
+                try:
+                    total_notes = self.insert_within_limit(note)
+                    break
+                except OperationalError as error:
+                    if error.args[0] != ER_LOCK_DEADLOCK or attempt == self.create_attempts:
+                        raise
+                    log.info("Retrying note creation after a deadlock", exc_info=True)
+
             set_custom_attribute("notes.count", total_notes)
         except ValidationError as error:
             log.debug(error, exc_info=True)
@@ -416,10 +442,8 @@ class AnnotationListView(GenericAPIView):
                 {"error_msg": error_message}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        note.save()
-
-        location = reverse(
-            "api:v1:annotations_detail", kwargs={"annotation_id": note.id}
+        location = annotation_detail_url_template(get_script_prefix(), get_urlconf()).replace(
+            ANNOTATION_ID_PLACEHOLDER, str(note.id)
         )
         serializer = NoteSerializer(note)
         return Response(
@@ -428,6 +452,31 @@ class AnnotationListView(GenericAPIView):
             headers={"Location": location},
         )
 
+    @staticmethod
+    def insert_within_limit(note):
+        """
+        Insert the note unless its user already has the maximum number of notes in its course.
+
+        Returns the number of notes the user had in the course before.
+        """
+        with transaction.atomic():
+            # Lock the user's notes in the course, so that concurrent creates
+            # cannot all pass the limit check before any of them is saved.
+            # Reading past the limit would not change the outcome, so stop there.
+            # With no notes yet, MySQL only takes gap locks, which lets two first
+            # creates deadlock on their inserts; the caller retries those.
+            total_notes = len(
+                Note.objects.select_for_update().filter(
+                    user_id=note.user_id,
+                    course_id=note.course_id,
+                ).values_list("pk", flat=True)[:settings.MAX_NOTES_PER_COURSE]
+            )
+            if total_notes >= settings.MAX_NOTES_PER_COURSE:
+                raise AnnotationsLimitReachedError
+
+            note.save()
+        return total_notes
+
 
 class AnnotationDetailView(APIView):
     """
@@ -498,6 +547,8 @@ class AnnotationDetailView(APIView):
         * HTTP_204_NO_CONTENT is returned
     """
 
+    updated_fields = ("text", "tags", "updated")
+
     def get(self, *args, **kwargs):
         """
         Get an existing annotation.
@@ -509,8 +560,16 @@ class AnnotationDetailView(APIView):
         except Note.DoesNotExist:
             return Response("Annotation not found!", status=status.HTTP_404_NOT_FOUND)
 
-        serializer = NoteSerializer(note)
-        return Response(serializer.data)
+        # Every change to a note bumps `updated`, so it validates the client's copy.
+        etag = f'W/"{note.id}-{note.updated.timestamp():.6f}"'
+        last_modified = int(note.updated.timestamp())
+        response = get_conditional_response(self.request, etag=etag, last_modified=last_modified)
+        if response is None:
+            serializer = NoteSerializer(note)
+            response = Response(serializer.data)
+        response.headers["ETag"] = etag
+        response.headers["Last-Modified"] = http_date(last_modified)
+        return response
 
     def put(self, *args, **kwargs):
         """
@@ -528,13 +587,14 @@ class AnnotationDetailView(APIView):
 
         try:
             note.text = self.request.data["text"]
-            note.tags = json.dumps(self.request.data["tags"])
-            note.full_clean()
-        except KeyError as error:
+            note.tags = orjson.dumps(self.request.data["tags"]).decode()
+            note.full_clean(exclude=[f.name for f in Note._meta.fields if f.name not in self.updated_fields])
+        except (KeyError, orjson.JSONEncodeError) as error:
             log.debug(error, exc_info=True)
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
-        note.save()
+        # Only write what changed; the post_save signal still reindexes the note.
+        note.save(update_fields=self.updated_fields)
 
         serializer = NoteSerializer(note)
         return Response(serializer.data)
@@ -545,15 +605,12 @@ class AnnotationDetailView(APIView):
         """
         note_id = self.kwargs.get("annotation_id")
 
-        try:
-            note = Note.objects.get(id=note_id)
-        except Note.DoesNotExist:
+        deleted = Note.objects.filter(id=note_id).delete()[0]
+        if not deleted:
             return Response(
                 "Annotation not found! No update performed.",
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        note.delete()
-
         # Annotation deleted successfully.
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -1,3 +1,4 @@
+import functools
 import logging
 import traceback
 
@@ -7,7 +8,6 @@ from django_elasticsearch_dsl_drf.constants import (
     SEPARATOR_LOOKUP_COMPLEX_VALUE,
 )
 from django_elasticsearch_dsl_drf.filter_backends import (
-    DefaultOrderingFilterBackend,
     HighlightBackend,
 )
 from elasticsearch.exceptions import TransportError
@@ -32,6 +32,12 @@ logger = logging.getLogger(__name__)
 
 class AnnotationSearchView(BaseAnnotationSearchView):
 
+    # `id` breaks ties between notes updated at the same time, so `search_after` cursors are stable.
+    ordering = ("-updated", "-id")
+
+    # Read by `FilteringFilterBackend` to resolve the document type of the filtered fields.
+    mapping = NoteDocument._doc_type.mapping.properties.name  # pylint: disable=protected-access
+
     # https://django-elasticsearch-dsl-drf.readthedocs.io/en/latest/advanced_usage_examples.html
     filter_fields = {
         "course_id": "course_id",
@@ -63,18 +69,11 @@ class AnnotationSearchView(BaseAnnotationSearchView):
         },
     }
 
-    def __init__(self, *args, **kwargs):
-        self.client = connections.get_connection(
-            NoteDocument._get_using()
-        )
-        self.index = NoteDocument._index._name
-        self.mapping = (
-            NoteDocument._doc_type.mapping.properties.name
-        )
-        self.search = Search(
-            using=self.client, index=self.index, doc_type=NoteDocument._doc_type.name
-        )
-        super().__init__(*args, **kwargs)
+    text_search_filter_backends = (
+        FilteringFilterBackend,
+        CompoundSearchFilterBackend,
+    )
+    highlight_filter_backends = text_search_filter_backends + (HighlightBackend,)
 
     def get_serializer_class(self):
         """
@@ -90,21 +89,17 @@ class AnnotationSearchView(BaseAnnotationSearchView):
         """
         if not self.is_text_search:
             return super().get_queryset()
-        queryset = self.search.query()
+        # Sorting clones the cached search; clones do not carry plain attributes over from it.
+        queryset = _get_es_search().sort(*self.ordering)
         queryset.model = NoteDocument.Django.model
         return queryset
 
     def get_filter_backends(self):
         if not self.is_text_search:
             return super().get_filter_backends()
-        filter_backends = [
-            FilteringFilterBackend,
-            CompoundSearchFilterBackend,
-            DefaultOrderingFilterBackend,
-        ]
         if self.params.get("highlight"):
-            filter_backends.append(HighlightBackend)
-        return filter_backends
+            return self.highlight_filter_backends
+        return self.text_search_filter_backends
 
     @property
     def pagination_class(self):
@@ -139,3 +134,16 @@ class AnnotationSearchView(BaseAnnotationSearchView):
 
 def get_es():
     return connections.get_connection()
+
+
+@functools.cache
+def _get_es_search():
+    """
+    Base `Search` over the notes index, built once per process; every query works on a clone of it.
+    """
+    # pylint: disable=protected-access
+    return Search(
+        using=connections.get_connection(NoteDocument._get_using()),
+        index=NoteDocument._index._name,
+        doc_type=NoteDocument._doc_type.name,
+    )
@@ -25,6 +25,8 @@ ELASTICSEARCH_DSL_INDEX_SETTINGS = {'number_of_shards': 1, 'number_of_replicas':
 # Name of the Elasticsearch index
 ELASTICSEARCH_INDEX_NAMES = {'notesapi.v1.search_indexes.documents.note': 'edx_notes_api'}
 ELASTICSEARCH_DSL_SIGNAL_PROCESSOR = 'django_elasticsearch_dsl.signals.RealTimeSignalProcessor'
+# Use parallel bulk requests when (re)building the index with `search_index`.
+ELASTICSEARCH_DSL_PARALLEL = True
 
 # Number of rows to return by default in result.
 RESULTS_DEFAULT_SIZE = 25
@@ -82,7 +84,7 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': ['rest_framework.authentication.SessionAuthentication'],
     'DEFAULT_PERMISSION_CLASSES': ['notesapi.v1.permissions.HasAccessToken'],
     'DEFAULT_PAGINATION_CLASS': 'notesapi.v1.paginators.NotesPaginator',
-    'DEFAULT_RENDERER_CLASSES': ('rest_framework.renderers.JSONRenderer',),
+    'DEFAULT_RENDERER_CLASSES': ('notesapi.v1.renderers.OrjsonRenderer',),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
@@ -141,6 +143,9 @@ DATABASES = {
         'PASSWORD': 'secret',
         'PORT': 3306,
         'USER': 'notes001',
+        # Keep connections open across requests, checking them before reuse.
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -26,6 +26,7 @@ DATABASES = {
         'HOST': os.environ.get('DB_HOST', 'edx.devstack.mysql'),
         'PORT': os.environ.get('DB_PORT', 3306),
         'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -24,6 +24,9 @@ ELASTICSEARCH_DSL = {'default': {'hosts': os.environ.get('ELASTICSEARCH_URL', 'l
 # Name of the Elasticsearch index
 ELASTICSEARCH_INDEX_NAMES = {'notesapi.v1.search_indexes.documents.note': 'notes_index_test'}
 
+# Parallel bulk indexing reads the notes from worker threads, which do not see the test transaction.
+ELASTICSEARCH_DSL_PARALLEL = False
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
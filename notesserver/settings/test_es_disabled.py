@@ -2,3 +2,5 @@ from .test import *  # pylint: disable=wildcard-import
 
 ES_DISABLED = True
 ELASTICSEARCH_DSL = {'default': {}}
+# Tests may still import the Elasticsearch views, which registers the notes document; keep it from indexing.
+ELASTICSEARCH_DSL_AUTOSYNC = False
@@ -49,13 +49,22 @@ class OperationalEndpointsTest(APITestCase):
         response = self.client.get(reverse('root'))
         self.assertEqual(response.status_code, 200)
         self.assertEqual(
-            response.data,
+            response.json(),
             {
                 "name": "edX Notes API",
                 "version": "1"
             }
         )
 
+    def test_robots(self):
+        """
+        Test robots.txt endpoint.
+        """
+        response = self.client.get(reverse('robots'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/plain')
+        self.assertEqual(response.content, b"User-agent: * Disallow: /")
+
     def test_selftest_status(self):
         """
         Test status success.
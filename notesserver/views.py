@@ -1,9 +1,12 @@
 import datetime
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 
+import orjson
 from django.db import connection
 from django.http import JsonResponse
 from django.http import HttpResponse
+from django.views.decorators.http import require_GET
 from edx_django_utils.monitoring import ignore_transaction
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
@@ -13,26 +16,29 @@ from rest_framework.response import Response
 from notesapi.v1.views import get_annotation_search_view_class
 from notesapi.v1.views import SearchViewRuntimeError
 
+# Static bodies are served by plain Django views, skipping DRF's negotiation and permission checks.
+ROOT_CONTENT = orjson.dumps({"name": "edX Notes API", "version": "1"})
+ROBOTS_CONTENT = b"User-agent: * Disallow: /"
 
-@api_view(['GET'])
-@permission_classes([AllowAny])
+# Runs the search backend check while the database is checked on the request thread, which
+# owns the Django connection. Threads are only started on first use, i.e. after gunicorn forks.
+_search_check_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="search-check")
+
+
+@require_GET
 def root(request):
     """
     Root view.
     """
-    return Response({
-        "name": "edX Notes API",
-        "version": "1"
-    })
+    return HttpResponse(ROOT_CONTENT, content_type="application/json")
 
 
-@api_view(['GET'])
-@permission_classes([AllowAny])
+@require_GET
 def robots(request):
     """
     robots.txt
     """
-    return HttpResponse("User-agent: * Disallow: /", content_type="text/plain")
+    return HttpResponse(ROBOTS_CONTENT, content_type="text/plain")
 
 
 @api_view(['GET'])
@@ -42,13 +48,14 @@ def heartbeat(request):
     ElasticSearch and database are reachable and ready to handle requests.
     """
     ignore_transaction()  # no need to record telemetry for heartbeats
+    search_check = _search_check_executor.submit(get_annotation_search_view_class().heartbeat)
     try:
         db_status()
     except Exception:  # pylint: disable=broad-exception-caught
         return JsonResponse({"OK": False, "check": "db"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     try:
-        get_annotation_search_view_class().heartbeat()
+        search_check.result()
     except SearchViewRuntimeError as e:
         return JsonResponse({"OK": False, "check": e.args[0]}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -62,24 +69,28 @@ def selftest(request):
     Manual test endpoint.
     """
     start = datetime.datetime.now()
+    search_check = _search_check_executor.submit(get_annotation_search_view_class().selftest)
+    try:
+        db_status()
+        db_error = None
+    except Exception:  # pylint: disable=broad-exception-caught
+        db_error = traceback.format_exc()
 
     response = {}
     try:
-        response.update(get_annotation_search_view_class().selftest())
+        response.update(search_check.result())
     except SearchViewRuntimeError as e:
         return Response(
             e.args[0],
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
-    try:
-        db_status()
-        response["db"] = "OK"
-    except Exception:  # pylint: disable=broad-exception-caught
+    if db_error is not None:
         return Response(
-            {"db_error": traceback.format_exc()},
+            {"db_error": db_error},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+    response["db"] = "OK"
 
     end = datetime.datetime.now()
     delta = end - start